@@ -1,8 +1,12 @@
 import os
 import asyncio
 import logging
+from collections import OrderedDict
+import uvloop
 from flask import Flask
-from pyrogram import Client, filters
+from pyrogram import Client, filters, utils
+from pyrogram.errors import FloodWait
+from pyrogram.raw import functions, types as raw_types
 from pyrogram.types import Message
 
 # Create Flask app for port binding
@@ -23,7 +27,221 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Forwarding pipeline settings
+FORWARD_DELAY = 0.3   # Starting gap between requests, adapted at runtime
+MIN_FORWARD_DELAY = 0.02
+FORWARD_BATCH = 100   # Max message IDs per ForwardMessages request
+PREFETCH_SIZE = 200   # Messages of history loaded ahead of forwarding
+PROGRESS_INTERVAL = 3 # Seconds between status message updates
+
+MAX_USER_STATES = 1024  # Oldest conversations are dropped beyond this
+
+# Static bot replies
+_HELP_TEXT = """
+🤖 **Public Channel Auto-Forward Bot**
+
+🚀 **Features:**
+• Auto-forward messages between public channels
+• Edit captions while forwarding
+• No download/re-upload - direct forwarding
+• Batch processing with progress updates
+
+📋 **Commands:**
+`/forward` - Auto-forward between channels
+`/forward_edit` - Forward with caption editing
+`/status` - Check bot status
+`/stop` - Stop active forwarding
+
+⚡ **How to use:**
+1. Add bot as admin in destination channel
+2. Use commands and follow the steps
+3. Bot will handle everything automatically
+
+🔒 **Security:** Bot token only - no user session required!
+""".strip()
+
+_FORWARD_SOURCE_PROMPT = (
+    "🔄 **Auto-Forward Setup**\n\n"
+    "📥 **Step 1:** Send the **source channel**\n"
+    "• Username: `@channel_username`\n"
+    "• Public link: `https://t.me/channel_username`\n\n"
+    "I'll read from this public channel."
+)
+
+_EDIT_SOURCE_PROMPT = (
+    "🔧 **Auto-Forward with Caption Editing**\n\n"
+    "📥 **Step 1:** Send the **source channel**\n"
+    "• Username: `@channel_username`\n"
+    "• Public link: `https://t.me/channel_username`\n\n"
+    "I'll read from this public channel."
+)
+
+_DEST_PROMPT = (
+    "✅ **Source channel saved!**\n\n"
+    "📤 **Step 2:** Send the **destination channel**\n"
+    "• Username: `@channel_username`\n"
+    "• Channel ID: `-1001234567890`\n\n"
+    "⚠️ **Important:** Bot must be admin in destination channel!"
+)
+
+_FIND_PROMPT = (
+    "✅ **Destination saved!**\n\n"
+    "🔍 **Step 3:** What text should I **find** in captions?\n"
+    "**Examples:**\n"
+    "• `@Username`\n"
+    "• `unwanted text`\n"
+    "• `HaRsHiT2027`"
+)
+
+_LIMITS_PROMPT_SIMPLE = (
+    "✅ **Destination saved!**\n\n"
+    "📊 **Step 3:** Set forwarding limits\n"
+    "Send message count or `-` for no limit:\n"
+    "**Examples:**\n"
+    "• `100` - Forward 100 messages\n"
+    "• `500` - Forward 500 messages\n"
+    "• `-` - No limit (forward all)"
+)
+
+_REPLACE_PROMPT = (
+    "✅ **Find text saved!**\n\n"
+    "✏️ **Step 4:** What should I **replace it with**?\n"
+    "Send replacement text or `-` to remove:\n"
+    "**Examples:**\n"
+    "• `physics wallah` - Replace with this text\n"
+    "• `-` - Remove completely\n"
+    "• ` ` - Replace with space"
+)
+
+_LIMITS_PROMPT_EDIT = (
+    "📊 **Step 5:** Set forwarding limits\n"
+    "Send message count or `-` for no limit:\n"
+    "**Examples:**\n"
+    "• `100` - Forward 100 messages\n"
+    "• `-` - No limit (forward all)"
+)
+
+class _UserState:
+    """Conversation state for one user"""
+    __slots__ = ('mode', 'step', 'chat_id', 'source', 'destination', 'find_text', 'replace_text')
+
+    def __init__(self, mode, step, chat_id):
+        self.mode = mode
+        self.step = step
+        self.chat_id = chat_id
+        self.source = None
+        self.destination = None
+        self.find_text = None
+        self.replace_text = None
+
+class _AdaptiveLimiter:
+    """Spaces requests delay seconds apart, speeding up on success and backing off on FloodWait"""
+
+    def __init__(self, delay, min_delay, speedup_after=100):
+        self.delay = delay
+        self.min_delay = min_delay
+        self.speedup_after = speedup_after
+        self._successes = 0
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+
+    async def wait(self):
+        """Sleep until this caller's turn to send"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+            # A FloodWait may have arrived while this caller slept on its slot
+            if loop.time() >= self._blocked_until:
+                return
+
+    def success(self):
+        self._successes += 1
+        if self._successes >= self.speedup_after:
+            self._successes = 0
+            self.delay = max(self.min_delay, self.delay * 0.9)
+
+    def flood_wait(self, seconds):
+        self._successes = 0
+        self.delay = max(self.delay, seconds / 20)
+        # Hold every sender, including ones already waiting, until Telegram's wait is over
+        self._blocked_until = max(self._blocked_until, asyncio.get_running_loop().time() + seconds)
+        self._next_slot = max(self._next_slot, self._blocked_until)
+
 class PublicAutoForwardBot:
+    # Status message templates, filled with str.format_map
+    _SIMPLE_START_TMPL = (
+        "🚀 **Auto-Forward Started**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Limit:** {limit}\n"
+        "**Status:** Starting...\n"
+        "**Progress:** 0 messages"
+    )
+    _SIMPLE_PROGRESS_TMPL = (
+        "🚀 **Auto-Forward Progress**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Status:** Running...\n"
+        "**Progress:** {count} messages forwarded"
+    )
+    _SIMPLE_DONE_TMPL = (
+        "✅ **Auto-Forward Completed!**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Total Forwarded:** {count} messages\n"
+        "**Status:** Successfully finished!"
+    )
+    _SIMPLE_STOPPED_TMPL = (
+        "🛑 **Auto-Forward Stopped**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Total Forwarded:** {count} messages\n"
+        "**Status:** Stopped by user"
+    )
+    _EDIT_START_TMPL = (
+        "🔧 **Edit-Forward Started**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Editing:** {action} '{find_text}'\n"
+        "**Limit:** {limit}\n"
+        "**Status:** Starting...\n"
+        "**Progress:** 0 messages (0 edited)"
+    )
+    _EDIT_PROGRESS_TMPL = (
+        "🔧 **Edit-Forward Progress**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Status:** Running...\n"
+        "**Progress:** {count} messages forwarded\n"
+        "**Edited:** {edited} captions"
+    )
+    _EDIT_DONE_TMPL = (
+        "✅ **Edit-Forward Completed!**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Total Forwarded:** {count} messages\n"
+        "**Captions Edited:** {edited}\n"
+        "**Action:** {action} '{find_text}'\n"
+        "**Status:** Successfully finished!"
+    )
+    _EDIT_STOPPED_TMPL = (
+        "🛑 **Edit-Forward Stopped**\n"
+        "**Source:** `{source}`\n"
+        "**Destination:** `{destination}`\n"
+        "**Total Forwarded:** {count} messages\n"
+        "**Captions Edited:** {edited}\n"
+        "**Status:** Stopped by user"
+    )
+
     def __init__(self):
         self.bot_token = os.getenv('BOT_TOKEN')
         self.api_id = int(os.getenv('API_ID'))
@@ -37,15 +255,42 @@ class PublicAutoForwardBot:
             "public_autoforward_bot",
             api_id=self.api_id,
             api_hash=self.api_hash,
-            bot_token=self.bot_token
+            bot_token=self.bot_token,
+            workers=int(os.getenv('PYROGRAM_WORKERS', 4))  # Concurrent update handlers, ours are light
         )
         
-        self.is_forwarding = False
-        self.user_states = {}  # For multi-step conversations
+        self.jobs = {}  # user_id -> running forward task
+        self.limiter = _AdaptiveLimiter(FORWARD_DELAY, MIN_FORWARD_DELAY)  # Shared by all jobs
+        self.user_states = OrderedDict()  # For multi-step conversations, LRU order
+        self._step_table = {
+            'waiting_source': self._handle_source_step,
+            'waiting_destination': self._handle_destination_step,
+            'waiting_find_text': self._handle_find_text_step,
+            'waiting_replace_text': self._handle_replace_text_step,
+            'waiting_limits': self._handle_limits_step,
+        }
         self.setup_handlers()
         
         logger.info("🤖 Public Auto-Forward Bot Initialized!")
 
+    def _get_state(self, user_id):
+        """Return conversation state for a user, or None"""
+        state = self.user_states.get(user_id)
+        if state is not None:
+            self.user_states.move_to_end(user_id)
+        return state
+
+    def _set_state(self, user_id, state):
+        """Store conversation state, evicting the least recently used one when full"""
+        self.user_states[user_id] = state
+        self.user_states.move_to_end(user_id)
+        if len(self.user_states) > MAX_USER_STATES:
+            self.user_states.popitem(last=False)
+
+    def _clear_state(self, user_id):
+        """Drop conversation state for a user"""
+        self.user_states.pop(user_id, None)
+
     def setup_handlers(self):
         """Setup all message handlers"""
         
@@ -75,73 +320,37 @@ class PublicAutoForwardBot:
 
     async def handle_start(self, message: Message):
         """Handle /start command"""
-        help_text = """
-🤖 **Public Channel Auto-Forward Bot**
-
-🚀 **Features:**
-• Auto-forward messages between public channels
-• Edit captions while forwarding
-• No download/re-upload - direct forwarding
-• Batch processing with progress updates
-
-📋 **Commands:**
-`/forward` - Auto-forward between channels
-`/forward_edit` - Forward with caption editing
-`/status` - Check bot status
-`/stop` - Stop active forwarding
-
-⚡ **How to use:**
-1. Add bot as admin in destination channel
-2. Use commands and follow the steps
-3. Bot will handle everything automatically
-
-🔒 **Security:** Bot token only - no user session required!
-        """
-        await message.reply(help_text)
+        await message.reply(_HELP_TEXT)
 
     async def handle_forward(self, message: Message):
         """Start simple forward process"""
         try:
-            await message.reply(
-                "🔄 **Auto-Forward Setup**\n\n"
-                "📥 **Step 1:** Send the **source channel**\n"
-                "• Username: `@channel_username`\n"
-                "• Public link: `https://t.me/channel_username`\n\n"
-                "I'll read from this public channel."
+            await message.reply(_FORWARD_SOURCE_PROMPT)
+            self._set_state(
+                message.from_user.id,
+                _UserState('simple_forward', 'waiting_source', message.chat.id)
             )
-            self.user_states[message.from_user.id] = {
-                'mode': 'simple_forward', 
-                'step': 'waiting_source',
-                'chat_id': message.chat.id
-            }
             
         except Exception as e:
             await message.reply(f"❌ Error: {str(e)}")
-            logger.error(f"Start forward error: {e}")
+            logger.error("Start forward error: %s", e)
 
     async def handle_forward_edit(self, message: Message):
         """Start forward with caption editing"""
         try:
-            await message.reply(
-                "🔧 **Auto-Forward with Caption Editing**\n\n"
-                "📥 **Step 1:** Send the **source channel**\n"
-                "• Username: `@channel_username`\n"
-                "• Public link: `https://t.me/channel_username`\n\n"
-                "I'll read from this public channel."
+            await message.reply(_EDIT_SOURCE_PROMPT)
+            self._set_state(
+                message.from_user.id,
+                _UserState('edit_forward', 'waiting_source', message.chat.id)
             )
-            self.user_states[message.from_user.id] = {
-                'mode': 'edit_forward', 
-                'step': 'waiting_source',
-                'chat_id': message.chat.id
-            }
             
         except Exception as e:
             await message.reply(f"❌ Error: {str(e)}")
-            logger.error(f"Start forward_edit error: {e}")
+            logger.error("Start forward_edit error: %s", e)
 
     async def handle_status(self, message: Message):
         """Check bot status"""
-        status = "🔄 **Forwarding in Progress**" if self.is_forwarding else "✅ **Ready & Idle**"
+        status = "🔄 **Forwarding in Progress**" if self.jobs else "✅ **Ready & Idle**"
         active_users = len(self.user_states)
         
         status_text = f"""
@@ -149,7 +358,7 @@ class PublicAutoForwardBot:
 
 📊 **Stats:**
 • Active conversations: {active_users}
-• Forwarding: {'Yes' if self.is_forwarding else 'No'}
+• Forwarding jobs: {len(self.jobs)}
 
 💡 Use `/forward` to start auto-forwarding!
         """
@@ -157,10 +366,11 @@ class PublicAutoForwardBot:
 
     async def handle_stop(self, message: Message):
         """Stop active forwarding"""
-        if self.is_forwarding:
-            self.is_forwarding = False
+        task = self.jobs.pop(message.from_user.id, None)
+        if task:
+            task.cancel()
             await message.reply("🛑 **Forwarding stopped!**")
-            logger.info("Forwarding stopped by user")
+            logger.info("Forwarding stopped by user %s", message.from_user.id)
         else:
             await message.reply("ℹ️ **No active forwarding to stop.**")
 
@@ -168,218 +378,395 @@ class PublicAutoForwardBot:
         """Handle multi-step conversation"""
         try:
             user_id = message.from_user.id
-            if user_id not in self.user_states:
+            user_data = self._get_state(user_id)
+            if user_data is None:
                 return
 
-            user_data = self.user_states[user_id]
-            current_step = user_data['step']
-            user_text = message.text.strip()
-
-            if current_step == 'waiting_source':
-                await self._handle_source_step(user_data, user_text, message)
-                
-            elif current_step == 'waiting_destination':
-                await self._handle_destination_step(user_data, user_text, message)
-                
-            elif current_step == 'waiting_find_text':
-                await self._handle_find_text_step(user_data, user_text, message)
-                
-            elif current_step == 'waiting_replace_text':
-                await self._handle_replace_text_step(user_data, user_text, message)
-                
-            elif current_step == 'waiting_limits':
-                await self._handle_limits_step(user_data, user_text, message)
+            handler = self._step_table.get(user_data.step)
+            if handler:
+                await handler(user_data, message.text.strip(), message)
 
         except Exception as e:
             await message.reply(f"❌ **Error in conversation:** {str(e)}")
-            logger.error(f"Conversation error: {e}")
-            if user_id in self.user_states:
-                del self.user_states[user_id]
+            logger.error("Conversation error: %s", e)
+            self._clear_state(user_id)
 
     async def _handle_source_step(self, user_data, user_text, message):
         """Handle source channel input"""
-        user_data['source'] = user_text
-        user_data['step'] = 'waiting_destination'
+        user_data.source = user_text
+        user_data.step = 'waiting_destination'
         
-        await message.reply(
-            "✅ **Source channel saved!**\n\n"
-            "📤 **Step 2:** Send the **destination channel**\n"
-            "• Username: `@channel_username`\n"
-            "• Channel ID: `-1001234567890`\n\n"
-            "⚠️ **Important:** Bot must be admin in destination channel!"
-        )
+        await message.reply(_DEST_PROMPT)
 
     async def _handle_destination_step(self, user_data, user_text, message):
         """Handle destination channel input"""
-        user_data['destination'] = user_text
+        user_data.destination = user_text
         
-        if user_data['mode'] == 'edit_forward':
-            user_data['step'] = 'waiting_find_text'
-            await message.reply(
-                "✅ **Destination saved!**\n\n"
-                "🔍 **Step 3:** What text should I **find** in captions?\n"
-                "**Examples:**\n"
-                "• `@Username`\n"
-                "• `unwanted text`\n"
-                "• `HaRsHiT2027`"
-            )
+        if user_data.mode == 'edit_forward':
+            user_data.step = 'waiting_find_text'
+            await message.reply(_FIND_PROMPT)
         else:
-            user_data['step'] = 'waiting_limits'
-            await message.reply(
-                "✅ **Destination saved!**\n\n"
-                "📊 **Step 3:** Set forwarding limits\n"
-                "Send message count or `-` for no limit:\n"
-                "**Examples:**\n"
-                "• `100` - Forward 100 messages\n"
-                "• `500` - Forward 500 messages\n"
-                "• `-` - No limit (forward all)"
-            )
+            user_data.step = 'waiting_limits'
+            await message.reply(_LIMITS_PROMPT_SIMPLE)
 
     async def _handle_find_text_step(self, user_data, user_text, message):
         """Handle find text input"""
-        user_data['find_text'] = user_text
-        user_data['step'] = 'waiting_replace_text'
+        user_data.find_text = user_text
+        user_data.step = 'waiting_replace_text'
         
-        await message.reply(
-            "✅ **Find text saved!**\n\n"
-            "✏️ **Step 4:** What should I **replace it with**?\n"
-            "Send replacement text or `-` to remove:\n"
-            "**Examples:**\n"
-            "• `physics wallah` - Replace with this text\n"
-            "• `-` - Remove completely\n"
-            "• ` ` - Replace with space"
-        )
+        await message.reply(_REPLACE_PROMPT)
 
     async def _handle_replace_text_step(self, user_data, user_text, message):
         """Handle replace text input"""
-        user_data['replace_text'] = "" if user_text == "-" else user_text
-        user_data['step'] = 'waiting_limits'
+        user_data.replace_text = "" if user_text == "-" else user_text
+        user_data.step = 'waiting_limits'
         
         action = "remove" if user_text == "-" else f"replace with '{user_text}'"
-        await message.reply(
-            f"✅ **Replace text saved!** (Will {action})\n\n"
-            "📊 **Step 5:** Set forwarding limits\n"
-            "Send message count or `-` for no limit:\n"
-            "**Examples:**\n"
-            "• `100` - Forward 100 messages\n"
-            "• `-` - No limit (forward all)"
-        )
+        await message.reply(f"✅ **Replace text saved!** (Will {action})\n\n" + _LIMITS_PROMPT_EDIT)
 
     async def _handle_limits_step(self, user_data, user_text, message):
         """Handle limits input and start forwarding"""
         # Parse limits
-        limit = None
-        if user_text != "-" and user_text.isdigit():
-            limit = int(user_text)
-            if limit <= 0:
-                await message.reply("❌ Limit must be greater than 0")
+        if user_text == "-":
+            limit = None
+        else:
+            try:
+                limit = int(user_text)
+                if limit <= 0:
+                    raise ValueError
+            except ValueError:
+                await message.reply("❌ Limit must be a positive number or `-`")
                 return
 
         # Get all collected data
-        source = user_data['source']
-        destination = user_data['destination']
-        mode = user_data['mode']
+        source = user_data.source
+        destination = user_data.destination
+        mode = user_data.mode
 
         # Clean up user state
         user_id = message.from_user.id
-        del self.user_states[user_id]
+        self._clear_state(user_id)
 
-        # Check if already forwarding
-        if self.is_forwarding:
-            await message.reply("❌ **Another forwarding job is running!** Use `/stop` first.")
+        # Check if this user is already forwarding
+        if user_id in self.jobs:
+            await message.reply("❌ **You already have a forwarding job running!** Use `/stop` first.")
             return
 
         await message.reply("🚀 **Starting auto-forward...**")
 
         # Start the appropriate forwarding process
         if mode == 'edit_forward':
-            find_text = user_data['find_text']
-            replace_text = user_data['replace_text']
-            asyncio.create_task(
+            find_text = user_data.find_text
+            replace_text = user_data.replace_text
+            task = asyncio.create_task(
                 self.execute_edit_forward(message, source, destination, find_text, replace_text, limit)
             )
         else:
-            asyncio.create_task(
+            task = asyncio.create_task(
                 self.execute_simple_forward(message, source, destination, limit)
             )
 
+        self.jobs[user_id] = task
+        task.add_done_callback(lambda t: self._finish_job(user_id, t))
+
+    def _finish_job(self, user_id, task):
+        """Forget a finished job unless a newer one replaced it"""
+        if self.jobs.get(user_id) is task:
+            del self.jobs[user_id]
+
+    async def _iter_history_ids(self, peer, limit):
+        """Yield message IDs newest first from raw GetHistory pages, without building Message objects"""
+        offset_id = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page = 100 if remaining is None else min(100, remaining)
+            result = await self._call(
+                self.app.invoke,
+                functions.messages.GetHistory(
+                    peer=peer,
+                    offset_id=offset_id,
+                    offset_date=0,
+                    add_offset=0,
+                    limit=page,
+                    max_id=0,
+                    min_id=0,
+                    hash=0
+                ),
+                sleep_threshold=0  # Let FloodWait reach the limiter
+            )
+            if not result.messages:
+                return
+
+            # Service messages and empty slots can't be forwarded
+            for msg in result.messages:
+                if isinstance(msg, raw_types.Message):
+                    yield msg.id
+
+            if remaining is not None:
+                remaining -= len(result.messages)
+            offset_id = result.messages[-1].id
+
+    async def _fill_queue(self, queue, history):
+        """Read history into queue as batches, ending with None"""
+        cancelled = False
+        try:
+            batch = []
+            async for item in history:
+                batch.append(item)
+                if len(batch) == FORWARD_BATCH:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            await history.aclose()
+            # Tell the consumer to stop. When cancelled the consumer is already
+            # gone and a full queue would block forever.
+            if not cancelled:
+                await queue.put(None)
+
+    async def _run_pipeline(self, history, process):
+        """Feed history items in batches, in order, to process(batch)"""
+        queue = asyncio.Queue(maxsize=max(1, PREFETCH_SIZE // FORWARD_BATCH))
+
+        # History keeps loading in the background while batches are forwarded.
+        # A single consumer keeps the destination in history order; each
+        # request already carries a whole batch, so more would only add bursts.
+        producer = asyncio.create_task(self._fill_queue(queue, history))
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+
+                try:
+                    await process(batch)
+                except Exception as e:
+                    logger.error("Failed to process batch of %d messages: %s", len(batch), e)
+            await producer
+        finally:
+            producer.cancel()
+            # Let the producer unwind and close the history generator
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _progress_reporter(self, status_msg, render):
+        """Periodically edit status_msg with render() until cancelled"""
+        last_text = None
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            try:
+                text = render()
+                if text == last_text:
+                    continue
+
+                await self._call(status_msg.edit, text)
+                last_text = text
+            except Exception as e:
+                logger.error("Progress update failed: %s", e)
+
+    async def _call(self, func, *args, **kwargs):
+        """Run one Telegram request under the shared limiter, retrying after FloodWait"""
+        while True:
+            await self.limiter.wait()
+            try:
+                result = await func(*args, **kwargs)
+            except FloodWait as e:
+                logger.warning("FloodWait for %s seconds, slowing down", e.value)
+                self.limiter.flood_wait(e.value)
+                continue
+
+            self.limiter.success()
+            return result
+
+    async def _forward_ids(self, from_peer, to_peer, message_ids, drop_author=False):
+        """Forward message IDs between already-resolved peers in one request
+
+        Returns a dict mapping each source message ID to its new ID in the
+        destination (None if Telegram did not report it).
+        """
+        random_ids = [self.app.rnd_id() for _ in message_ids]
+        updates = await self.app.invoke(
+            functions.messages.ForwardMessages(
+                from_peer=from_peer,
+                id=message_ids,
+                random_id=random_ids,
+                to_peer=to_peer,
+                drop_author=drop_author or None
+            ),
+            sleep_threshold=0  # Let FloodWait reach the limiter
+        )
+
+        new_ids = {}
+        new_messages = []
+        for update in getattr(updates, 'updates', []):
+            if isinstance(update, raw_types.UpdateMessageID):
+                new_ids[update.random_id] = update.id
+            elif isinstance(update, (raw_types.UpdateNewChannelMessage, raw_types.UpdateNewMessage)):
+                new_messages.append(update.message.id)
+
+        sent = {msg_id: new_ids.get(rnd) for msg_id, rnd in zip(message_ids, random_ids)}
+
+        # Without UpdateMessageID entries, pair the new messages with the
+        # source IDs by order, which is the order they were sent in
+        missing = [msg_id for msg_id, new_id in sent.items() if new_id is None]
+        if missing:
+            unclaimed = sorted(set(new_messages) - set(new_ids.values()))
+            if len(unclaimed) == len(missing):
+                sent.update(zip(missing, unclaimed))
+            else:
+                logger.error(
+                    "Could not match %d forwarded messages to their new IDs (%d candidates)",
+                    len(missing), len(unclaimed)
+                )
+        return sent
+
+    async def _forward_batch(self, from_peer, to_peer, message_ids, drop_author=False):
+        """Forward message IDs in one request, retrying one by one if the batch fails
+
+        Returns the _forward_ids mapping for the messages that were sent, so a
+        bad message only costs itself rather than the whole batch.
+        """
+        try:
+            return await self._call(self._forward_ids, from_peer, to_peer, message_ids, drop_author)
+        except Exception as e:
+            if len(message_ids) == 1:
+                logger.error("Failed to forward message %s: %s", message_ids[0], e)
+                return {}
+            logger.error("Batch of %d messages failed, retrying one by one: %s", len(message_ids), e)
+
+        sent = {}
+        for msg_id in message_ids:
+            try:
+                sent.update(await self._call(self._forward_ids, from_peer, to_peer, [msg_id], drop_author))
+            except Exception as e:
+                logger.error("Failed to forward message %s: %s", msg_id, e)
+        return sent
+
+    @staticmethod
+    def _peer_chat_id(peer):
+        """Chat ID for a resolved InputPeer, so later calls skip parsing the user's input"""
+        if isinstance(peer, raw_types.InputPeerChannel):
+            return utils.get_channel_id(peer.channel_id)
+        if isinstance(peer, raw_types.InputPeerChat):
+            return -peer.chat_id
+        return peer.user_id
+
+    async def _set_caption(self, chat_id, msg, new_id, caption):
+        """Give the forwarded copy new_id of msg its edited caption
+
+        If the edit fails the copy is deleted and msg is copied with the new
+        caption instead, so the original caption never stays published. Without
+        new_id the copy can't be reached, so msg is still copied and it is logged.
+        Returns True once the destination holds the message with the new caption.
+        """
+        if new_id is None:
+            logger.error(
+                "Forwarded copy of message %s was not reported and keeps its old caption, "
+                "copying with the new caption", msg.id
+            )
+        else:
+            try:
+                await self._call(self.app.edit_message_caption, chat_id, new_id, caption)
+                return True
+            except Exception as e:
+                logger.error("Failed to edit caption of message %s, copying instead: %s", msg.id, e)
+
+            try:
+                await self._call(self.app.delete_messages, chat_id, new_id)
+            except Exception as e:
+                logger.error("Failed to delete unedited copy of message %s: %s", msg.id, e)
+                return False
+
+        try:
+            await self._call(msg.copy, chat_id, caption=caption)
+            return True
+        except Exception as e:
+            logger.error("Failed to copy message %s: %s", msg.id, e)
+            return False
+
     async def execute_simple_forward(self, message, source, destination, limit):
         """Execute simple forward without editing"""
+        forwarded_count = 0
+        status_msg = None
         try:
-            self.is_forwarding = True
-            forwarded_count = 0
-            
             # Clean source input
             if source.startswith('https://t.me/'):
                 source = source.split('/')[-1].lstrip('@')
             source = source.lstrip('@')
             
             # Send initial status
-            status_msg = await message.reply(
-                f"🚀 **Auto-Forward Started**\n"
-                f"**Source:** `{source}`\n"
-                f"**Destination:** `{destination}`\n"
-                f"**Limit:** {limit or 'No limit'}\n"
-                f"**Status:** Starting...\n"
-                f"**Progress:** 0 messages"
-            )
+            status_msg = await self._call(message.reply, self._SIMPLE_START_TMPL.format_map({
+                'source': source,
+                'destination': destination,
+                'limit': limit or 'No limit'
+            }))
             
-            logger.info(f"Starting simple forward: {source} -> {destination}, limit: {limit}")
+            logger.info("Starting simple forward: %s -> %s, limit: %s", source, destination, limit)
             
-            # Start forwarding
-            async for msg in self.app.get_chat_history(source, limit=limit):
-                if not self.is_forwarding:
-                    break
-                    
-                try:
-                    await msg.forward(destination)
-                    forwarded_count += 1
-                    
-                    # Update progress every 20 messages
-                    if forwarded_count % 20 == 0:
-                        await status_msg.edit(
-                            f"🚀 **Auto-Forward Progress**\n"
-                            f"**Source:** `{source}`\n"
-                            f"**Destination:** `{destination}`\n"
-                            f"**Status:** Running...\n"
-                            f"**Progress:** {forwarded_count} messages forwarded"
-                        )
-                        logger.info(f"Progress: {forwarded_count} messages forwarded")
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to forward message {msg.id}: {e}")
-                    continue
+            # Resolve both chats once instead of on every request
+            source_peer = await self._call(self.app.resolve_peer, source)
+            dest_peer = await self._call(self.app.resolve_peer, destination)
+
+            async def process(batch):
+                nonlocal forwarded_count
+                sent = await self._forward_batch(source_peer, dest_peer, batch)
+                forwarded_count += len(sent)
+                logger.info("Progress: %d messages forwarded", forwarded_count)
+
+            def render():
+                return self._SIMPLE_PROGRESS_TMPL.format_map({
+                    'source': source,
+                    'destination': destination,
+                    'count': forwarded_count
+                })
+
+            # Start forwarding, status is updated in the background
+            reporter = asyncio.create_task(self._progress_reporter(status_msg, render))
+            try:
+                # Only IDs are needed here, so skip building Message objects
+                await self._run_pipeline(self._iter_history_ids(source_peer, limit), process)
+            finally:
+                reporter.cancel()
+                await asyncio.gather(reporter, return_exceptions=True)
             
             # Completion message
-            completion_text = (
-                f"✅ **Auto-Forward Completed!**\n"
-                f"**Source:** `{source}`\n"
-                f"**Destination:** `{destination}`\n"
-                f"**Total Forwarded:** {forwarded_count} messages\n"
-                f"**Status:** Successfully finished!"
-            )
-            await status_msg.edit(completion_text)
-            await message.reply("🎉 **Job completed successfully!**")
+            completion_text = self._SIMPLE_DONE_TMPL.format_map({
+                'source': source,
+                'destination': destination,
+                'count': forwarded_count
+            })
+            await self._call(status_msg.edit, completion_text)
+            await self._call(message.reply, "🎉 **Job completed successfully!**")
             
-            logger.info(f"Simple forward completed: {forwarded_count} messages")
+            logger.info("Simple forward completed: %d messages", forwarded_count)
             
         except Exception as e:
             error_msg = f"❌ **Forwarding failed:** {str(e)}"
             await message.reply(error_msg)
-            logger.error(f"Simple forward error: {e}")
-        finally:
-            self.is_forwarding = False
+            logger.error("Simple forward error: %s", e)
+        except asyncio.CancelledError:
+            # The reporter has already been cancelled and awaited, so this edit is final
+            logger.info("Simple forward stopped: %d messages", forwarded_count)
+            if status_msg:
+                try:
+                    await status_msg.edit(self._SIMPLE_STOPPED_TMPL.format_map({
+                        'source': source,
+                        'destination': destination,
+                        'count': forwarded_count
+                    }))
+                except Exception as e:
+                    logger.error("Failed to report stopped job: %s", e)
+            raise
 
     async def execute_edit_forward(self, message, source, destination, find_text, replace_text, limit):
         """Execute forward with caption editing"""
+        forwarded_count = 0
+        edited_count = 0
+        status_msg = None
         try:
-            self.is_forwarding = True
-            forwarded_count = 0
-            edited_count = 0
-            
             # Clean source input
             if source.startswith('https://t.me/'):
                 source = source.split('/')[-1].lstrip('@')
@@ -388,87 +775,124 @@ class PublicAutoForwardBot:
             action = "removed" if replace_text == "" else f"replaced with '{replace_text}'"
             
             # Send initial status
-            status_msg = await message.reply(
-                f"🔧 **Edit-Forward Started**\n"
-                f"**Source:** `{source}`\n"
-                f"**Destination:** `{destination}`\n"
-                f"**Editing:** {action} '{find_text}'\n"
-                f"**Limit:** {limit or 'No limit'}\n"
-                f"**Status:** Starting...\n"
-                f"**Progress:** 0 messages (0 edited)"
-            )
+            status_msg = await self._call(message.reply, self._EDIT_START_TMPL.format_map({
+                'source': source,
+                'destination': destination,
+                'action': action,
+                'find_text': find_text,
+                'limit': limit or 'No limit'
+            }))
             
-            logger.info(f"Starting edit forward: {source} -> {destination}, find: '{find_text}', replace: '{replace_text}'")
+            logger.info("Starting edit forward: %s -> %s, find: '%s', replace: '%s'", source, destination, find_text, replace_text)
             
-            # Start forwarding with editing
-            async for msg in self.app.get_chat_history(source, limit=limit):
-                if not self.is_forwarding:
-                    break
-                    
-                try:
-                    # Check if caption needs editing
-                    if msg.caption and find_text in msg.caption:
-                        new_caption = msg.caption.replace(find_text, replace_text)
-                        await msg.copy(destination, caption=new_caption)
-                        edited_count += 1
+            # Resolve both chats once instead of on every request
+            source_peer = await self._call(self.app.resolve_peer, source)
+            dest_peer = await self._call(self.app.resolve_peer, destination)
+            dest_chat_id = self._peer_chat_id(dest_peer)
+
+            async def process(batch):
+                nonlocal forwarded_count, edited_count
+                # Split the batch into runs of consecutive messages sent the same
+                # way, so the destination keeps the source order
+                runs = []  # (needs_edit, [(msg, new_caption), ...])
+                for msg in batch:
+                    if msg.empty or msg.service:
+                        continue
+
+                    # Single pass: replace() hands back an equal string when nothing matched
+                    caption = msg.caption
+                    new_caption = caption.replace(find_text, replace_text) if caption else None
+                    needs_edit = new_caption is not None and new_caption != caption
+
+                    if runs and runs[-1][0] == needs_edit:
+                        runs[-1][1].append((msg, new_caption))
                     else:
-                        await msg.forward(destination)
-                    
-                    forwarded_count += 1
-                    
-                    # Update progress every 20 messages
-                    if forwarded_count % 20 == 0:
-                        await status_msg.edit(
-                            f"🔧 **Edit-Forward Progress**\n"
-                            f"**Source:** `{source}`\n"
-                            f"**Destination:** `{destination}`\n"
-                            f"**Status:** Running...\n"
-                            f"**Progress:** {forwarded_count} messages forwarded\n"
-                            f"**Edited:** {edited_count} captions"
-                        )
-                        logger.info(f"Edit progress: {forwarded_count} forwarded, {edited_count} edited")
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to process message {msg.id}: {e}")
-                    continue
+                        runs.append((needs_edit, [(msg, new_caption)]))
+
+                for needs_edit, items in runs:
+                    msg_ids = [msg.id for msg, _ in items]
+
+                    # Unchanged messages go out in a single request
+                    if not needs_edit:
+                        sent = await self._forward_batch(source_peer, dest_peer, msg_ids)
+                        forwarded_count += len(sent)
+                        continue
+
+                    # Messages to edit are forwarded without the author header, which
+                    # keeps them editable, then only their captions are changed
+                    new_ids = await self._forward_batch(source_peer, dest_peer, msg_ids, drop_author=True)
+
+                    for msg, new_caption in items:
+                        # Messages missing here failed to forward and were logged already
+                        if msg.id in new_ids and await self._set_caption(
+                            dest_chat_id, msg, new_ids[msg.id], new_caption
+                        ):
+                            forwarded_count += 1
+                            edited_count += 1
+
+                logger.info("Edit progress: %d forwarded, %d edited", forwarded_count, edited_count)
+
+            def render():
+                return self._EDIT_PROGRESS_TMPL.format_map({
+                    'source': source,
+                    'destination': destination,
+                    'count': forwarded_count,
+                    'edited': edited_count
+                })
+
+            # Start forwarding with editing, status is updated in the background
+            reporter = asyncio.create_task(self._progress_reporter(status_msg, render))
+            try:
+                await self._run_pipeline(self.app.get_chat_history(source, limit=limit), process)
+            finally:
+                reporter.cancel()
+                await asyncio.gather(reporter, return_exceptions=True)
             
             # Completion message
-            completion_text = (
-                f"✅ **Edit-Forward Completed!**\n"
-                f"**Source:** `{source}`\n"
-                f"**Destination:** `{destination}`\n"
-                f"**Total Forwarded:** {forwarded_count} messages\n"
-                f"**Captions Edited:** {edited_count}\n"
-                f"**Action:** {action} '{find_text}'\n"
-                f"**Status:** Successfully finished!"
-            )
-            await status_msg.edit(completion_text)
-            await message.reply("🎉 **Job completed successfully!**")
+            completion_text = self._EDIT_DONE_TMPL.format_map({
+                'source': source,
+                'destination': destination,
+                'count': forwarded_count,
+                'edited': edited_count,
+                'action': action,
+                'find_text': find_text
+            })
+            await self._call(status_msg.edit, completion_text)
+            await self._call(message.reply, "🎉 **Job completed successfully!**")
             
-            logger.info(f"Edit forward completed: {forwarded_count} forwarded, {edited_count} edited")
+            logger.info("Edit forward completed: %d forwarded, %d edited", forwarded_count, edited_count)
             
         except Exception as e:
             error_msg = f"❌ **Edit-forwarding failed:** {str(e)}"
             await message.reply(error_msg)
-            logger.error(f"Edit forward error: {e}")
-        finally:
-            self.is_forwarding = False
+            logger.error("Edit forward error: %s", e)
+        except asyncio.CancelledError:
+            # The reporter has already been cancelled and awaited, so this edit is final
+            logger.info("Edit forward stopped: %d forwarded, %d edited", forwarded_count, edited_count)
+            if status_msg:
+                try:
+                    await status_msg.edit(self._EDIT_STOPPED_TMPL.format_map({
+                        'source': source,
+                        'destination': destination,
+                        'count': forwarded_count,
+                        'edited': edited_count
+                    }))
+                except Exception as e:
+                    logger.error("Failed to report stopped job: %s", e)
+            raise
 
     async def run_telegram_bot(self):
         """Run the Telegram bot part"""
         try:
             await self.app.start()
             me = await self.app.get_me()
-            logger.info(f"🤖 Bot started successfully: @{me.username}")
+            logger.info("🤖 Bot started successfully: @%s", me.username)
             logger.info("🚀 Public Auto-Forward Bot is running...")
             
             await asyncio.Future()  # Run forever
             
         except Exception as e:
-            logger.error(f"Telegram bot crashed: {e}")
+            logger.error("Telegram bot crashed: %s", e)
         finally:
             await self.app.stop()
 
@@ -485,4 +909,6 @@ async def main():
     )
 
 if __name__ == '__main__':
+    # Use libuv event loop for cheaper callbacks and socket polling
+    uvloop.install()
     asyncio.run(main())
\ No newline at end of file